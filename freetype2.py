@@ -35,7 +35,6 @@ import sys
 import math
 from numbers import \
     Real
-import array
 import ctypes as ct
 import struct
 import weakref
@@ -80,27 +79,35 @@ except OSError as fail :
 #end try
 libc = ct.cdll.LoadLibrary(LIBNAME["libc"])
 
+_struct_field_names = {}
+  # cached per-Structure tuples of field names, so struct_to_dict need not
+  # re-traverse the (name, type) pairs in _fields_ on every decode.
+
 def struct_to_dict(item, itemtype, indirect, extra_decode = None) :
     "decodes the elements of a ctypes Structure into a dict. extra_decode" \
     " optionally specifies special conversions for particular fields."
     if indirect :
         item = item.contents
     #end if
-    result = {}
-    for k in itemtype._fields_ :
-        k = k[0]
-        field = getattr(item, k)
-        if extra_decode != None :
-            decode = extra_decode.get(k)
-            if decode == None :
-                decode = extra_decode.get(None)
-            #end if
+    names = _struct_field_names.get(itemtype)
+    if names == None :
+        names = tuple(f[0] for f in itemtype._fields_)
+        _struct_field_names[itemtype] = names
+    #end if
+    if extra_decode == None :
+        result = dict((k, getattr(item, k)) for k in names)
+    else :
+        default_decode = extra_decode.get(None)
+        result = {}
+        for k in names :
+            field = getattr(item, k)
+            decode = extra_decode.get(k, default_decode)
             if decode != None :
                 field = decode(field)
             #end if
-        #end if
-        result[k] = field
-    #end for
+            result[k] = field
+        #end for
+    #end if
     return \
         result
 #end struct_to_dict
@@ -1294,7 +1301,34 @@ ft.FT_Stroker_ExportBorder.argtypes = (ct.c_void_p, FT.StrokerBorder, ct.c_void_
 ft.FT_Stroker_Export.argtypes = (ct.c_void_p, ct.c_void_p)
 ft.FT_Stroker_GetCounts.argtypes = (ct.c_void_p, ct.c_void_p, ct.c_void_p)
 
+# bound references to the hottest entry points, so the glyph-intensive
+# call paths (loading, iterating and rendering glyphs) don’t pay for
+# repeated CDLL attribute lookups on every call.
+_ft_load_glyph = ft.FT_Load_Glyph
+_ft_load_char = ft.FT_Load_Char
+_ft_render_glyph = ft.FT_Render_Glyph
+_ft_get_first_char = ft.FT_Get_First_Char
+_ft_get_next_char = ft.FT_Get_Next_Char
+_ft_get_advance = ft.FT_Get_Advance
+_ft_get_advances = ft.FT_Get_Advances
+_ft_get_kerning = ft.FT_Get_Kerning
+_ft_get_glyph = ft.FT_Get_Glyph
+_ft_outline_translate = ft.FT_Outline_Translate
+_ft_outline_transform = ft.FT_Outline_Transform
+_ft_outline_get_cbox = ft.FT_Outline_Get_CBox
+_ft_outline_get_bbox = ft.FT_Outline_Get_BBox
+_ft_outline_new = ft.FT_Outline_New
+_ft_outline_done = ft.FT_Outline_Done
+_ft_glyph_stroke = ft.FT_Glyph_Stroke
+_ft_stroker_set = ft.FT_Stroker_Set
+_ft_stroker_parse_outline = ft.FT_Stroker_ParseOutline
+_ft_stroker_get_counts = ft.FT_Stroker_GetCounts
+_ft_stroker_get_border_counts = ft.FT_Stroker_GetBorderCounts
+_ft_stroker_export = ft.FT_Stroker_Export
+_ft_stroker_export_border = ft.FT_Stroker_ExportBorder
+
 if fc != None :
+    fc.FcInit.argtypes = ()
     fc.FcInit.restype = ct.c_bool
     fc.FcNameParse.argtypes = (ct.c_char_p,)
     fc.FcNameParse.restype = ct.c_void_p
@@ -1326,6 +1360,8 @@ if fc != None :
     class _FcPatternManager :
         # context manager which collects a list of FcPattern objects requiring disposal.
 
+        __slots__ = ("to_dispose",) # to forestall typos
+
         def __init__(self) :
             self.to_dispose = []
         #end __init__
@@ -1356,28 +1392,43 @@ if fc != None :
 
 #end if
 
+_fc_inited = False
+
 def _ensure_fc() :
     # ensures Fontconfig is usable, raising suitable exceptions if not.
+    # FcInit is a no-op after the first successful call, but still a
+    # cross-library round-trip, so remember that it succeeded rather
+    # than calling it again per pattern resolution.
+    global _fc_inited
     if fc == None :
         raise NotImplementedError("Fontconfig not available")
     #end if
-    if not fc.FcInit() :
-        raise RuntimeError("failed to initialize Fontconfig.")
+    if not _fc_inited :
+        if not fc.FcInit() :
+            raise RuntimeError("failed to initialize Fontconfig.")
+        #end if
+        _fc_inited = True
     #end if
 #end _ensure_fc
 
 libc.free.argtypes = (ct.c_void_p,)
+libc.free.restype = None
 
 def make_fixed_conv(shift) :
     "returns two functions, the first converting a float value to fixed" \
     " point with shift places to the right of the binary point, the second" \
     " converting that format to a float."
+    # the conversion constants are bound as default args, so they are local
+    # fast loads rather than closure-cell derefs: these functions run once
+    # per coordinate of every decoded point. The reciprocal multiply in
+    # conv_from is exact, factor being a power of two. round() is kept in
+    # conv_to since the int(x * factor + 0.5) trick misrounds negatives.
     factor = 1 << shift
     places = (32 - shift, shift)
-    conv_to = lambda x : round(x * factor)
+    conv_to = lambda x, _factor = factor : round(x * _factor)
     conv_to.__name__ = "to_f%d_%d" % places
     conv_to.__doc__ = "converts a float value to fixed %d.%d format" % places
-    conv_from = lambda i : i / factor
+    conv_from = lambda i, _recip = 1 / factor : i * _recip
     conv_from.__name__ = "from_f%d_%d" % places
     conv_from.__doc__ = "converts a fixed %d.%d value to a float" % places
     return \
@@ -1387,13 +1438,21 @@ def make_fixed_conv(shift) :
 to_f26_6, from_f26_6 = make_fixed_conv(6)
 to_f16_16, from_f16_16 = make_fixed_conv(16)
 
+_from_tag_cache = {}
+  # there are only a handful of distinct tags in practice, so decode each
+  # just once.
+
 def from_tag(x) :
     "converts an integer tag code to more comprehensible four-character form."
-    try :
-        result = struct.pack(">I", x).decode("ascii")
-    except UnicodeDecodeError :
-        result = x
-    #end try
+    result = _from_tag_cache.get(x)
+    if result == None :
+        try :
+            result = bytes((x >> 24 & 255, x >> 16 & 255, x >> 8 & 255, x & 255)).decode("ascii")
+        except UnicodeDecodeError :
+            result = x
+        #end try
+        _from_tag_cache[x] = result
+    #end if
     return \
         result
 #end from_tag
@@ -1402,10 +1461,18 @@ class FTException(Exception) :
     "just to identify a FreeType-specific error exception."
 
     def __init__(self, code) :
-        self.args = (("FreeType error %d -- %s" % (code, Error.Message.get(code, "?"))),)
+        self.args = (code,)
         self.code = code
     #end __init__
 
+    def __str__(self) :
+        # message formatting is deferred to here, so raising (e.g. to probe
+        # for an optional table) doesn’t pay for it unless the message is
+        # actually displayed.
+        return \
+            "FreeType error %d -- %s" % (self.code, Error.Message.get(self.code, "?"))
+    #end __str__
+
 #end FTException
 
 def check(sts) :
@@ -1421,17 +1488,18 @@ def def_extra_fields(clas, simple_fields, struct_fields) :
     # “_ftobj” points to the FT object to be decoded.
 
     def def_simple_attr(field, doc, convert) :
+        # generate the getter body as source text, so the hot path is a plain
+        # attribute chain (plus the conversion call where applicable) with no
+        # generic getattr dispatch or convert != None check at read time.
         if convert != None :
-            def attr(self) :
-                return \
-                    convert(getattr(self._ftobj.contents, field))
-            #end attr
+            namespace = {"convert" : convert}
+            code = "def attr(self) :\n    return convert(self._ftobj.contents.%s)\n" % field
         else :
-            def attr(self) :
-                return \
-                    getattr(self._ftobj.contents, field)
-            #end attr
+            namespace = {}
+            code = "def attr(self) :\n    return self._ftobj.contents.%s\n" % field
         #end if
+        exec(code, namespace)
+        attr = namespace["attr"]
         if doc != None :
             attr.__doc__ = doc
         #end if
@@ -1439,19 +1507,43 @@ def def_extra_fields(clas, simple_fields, struct_fields) :
     #end def_simple_attr
 
     def def_struct_attr(field, fieldtype, indirect, doc, extra_decode) :
-
-        def attr(self) :
-            return \
-                struct_to_dict \
-                  (
-                    getattr(self._ftobj.contents, field),
-                    fieldtype,
-                    indirect,
-                    extra_decode
-                  )
-        #end attr
-
-    #begin def_struct_attr
+        # generated source, as for def_simple_attr, but with the whole decode
+        # expanded into a dict display: the field conversions are resolved
+        # now, once, rather than looked up in the extra_decode map on every
+        # access the way struct_to_dict does.
+        namespace = {}
+        if extra_decode != None :
+            default_decode = extra_decode.get(None)
+        else :
+            default_decode = None
+        #end if
+        terms = []
+        for name, _ in fieldtype._fields_ :
+            if extra_decode != None :
+                decode = extra_decode.get(name, default_decode)
+            else :
+                decode = None
+            #end if
+            if decode != None :
+                convname = "_conv_%s" % name
+                namespace[convname] = decode
+                terms.append("%r : %s(item.%s)" % (name, convname, name))
+            else :
+                terms.append("%r : item.%s" % (name, name))
+            #end if
+        #end for
+        access = "self._ftobj.contents.%s" % field
+        if indirect :
+            access += ".contents"
+        #end if
+        code = \
+            (
+                "def attr(self) :\n    item = %s\n    return {%s}\n"
+            %
+                (access, ", ".join(terms))
+            )
+        exec(code, namespace)
+        attr = namespace["attr"]
         if doc != None :
             attr.__doc__ = doc
         #end if
@@ -1475,18 +1567,45 @@ def ft_convs(clas, ft_type, fields) :
     # defines conversions to/from components of different fixed-point formats.
 
     def def_ft_conv(name, shift) :
-        if shift != 0 :
-            factor = 1 << shift
-            coord_to = lambda x : round(x * factor)
-            coord_from = lambda i : i / factor
+        # reuse the module-level fixed-point converters rather than making new
+        # lambdas per call, and generate straight-line positional bodies, so a
+        # conversion is one constructor call with no intermediate generator or
+        # tuple. These run per glyph (and per point) on the outline paths.
+        if shift == 6 :
+            coord_to = to_f26_6
+            coord_from = from_f26_6
+        elif shift == 16 :
+            coord_to = to_f16_16
+            coord_from = from_f16_16
         else :
-            coord_to = lambda x : round(x)
-            coord_from = lambda i : float(i)
+            coord_to = round
+            coord_from = float
         #end if
-        conv_to = lambda self : ft_type(*tuple(coord_to(getattr(self, k)) for k in fields))
+        namespace = \
+            {
+                "clas" : clas,
+                "ft_type" : ft_type,
+                "coord_to" : coord_to,
+                "coord_from" : coord_from,
+            }
+        exec \
+          (
+                "def conv_to(self) :\n    return ft_type(%s)\n"
+            %
+                ", ".join("coord_to(self.%s)" % k for k in fields),
+            namespace
+          )
+        exec \
+          (
+                "def conv_from(ftobj) :\n    return clas(%s)\n"
+            %
+                ", ".join("coord_from(ftobj.%s)" % k for k in fields),
+            namespace
+          )
+        conv_to = namespace["conv_to"]
         conv_to.__name__ = "to_ft_%s" % name
         conv_to.__doc__ = "returns an FT.%s value representing the contents of this %s with coordinates interpreted as %s" % (ft_type.__name__, clas.__name__, name)
-        conv_from = lambda ftobj : clas(*tuple(coord_from(getattr(ftobj, k)) for k in fields))
+        conv_from = namespace["conv_from"]
         conv_from.__name__ = "from_ft_%s" % name
         conv_from.__doc__ = "creates a new %s from an FT.%s with coordinates interpreted as %s" % (clas.__name__, ft_type.__name__, name)
         setattr(clas, conv_to.__name__, conv_to)
@@ -1546,19 +1665,23 @@ class Vector :
     #end __repr__
 
     def __add__(v1, v2) :
+        if isinstance(v2, Vector) :
+            result = Vector(v1.x + v2.x, v1.y + v2.y)
+        else :
+            result = NotImplemented
+        #end if
         return \
-            (
-                lambda : NotImplemented,
-                lambda : Vector(v1.x + v2.x, v1.y + v2.y)
-            )[isinstance(v2, Vector)]()
+            result
     #end __add__
 
     def __sub__(v1, v2) :
+        if isinstance(v2, Vector) :
+            result = Vector(v1.x - v2.x, v1.y - v2.y)
+        else :
+            result = NotImplemented
+        #end if
         return \
-            (
-                lambda : NotImplemented,
-                lambda : Vector(v1.x - v2.x, v1.y - v2.y)
-            )[isinstance(v2, Vector)]()
+            result
     #end __sub__
 
     def __mul__(v, f) :
@@ -1644,22 +1767,14 @@ class Matrix :
     @staticmethod
     def from_ft(mat) :
         "creates a new Matrix from an FT.Matrix value."
-        args = {}
-        for field, _ in FT.Matrix._fields_ :
-            args[field] = from_f16_16(getattr(mat, field))
-        #end for
         return \
-            Matrix(**args)
+            Matrix(from_f16_16(mat.xx), from_f16_16(mat.xy), from_f16_16(mat.yx), from_f16_16(mat.yy))
     #end from_ft
 
     def to_ft(self) :
         "returns an FT.Matrix value representing the conversion of this Matrix."
-        args = {}
-        for field, _ in FT.Matrix._fields_ :
-            args[field] = to_f16_16(getattr(self, field))
-        #end for
         return \
-            FT.Matrix(**args)
+            FT.Matrix(to_f16_16(self.xx), to_f16_16(self.xy), to_f16_16(self.yx), to_f16_16(self.yy))
     #end to_ft
 
     # I do my own implementations of arithmetic operations, since I don’t see
@@ -1667,21 +1782,30 @@ class Matrix :
 
     def __mul__(m1, m2) :
         "vector/matrix multiplication."
+        # field reads are hoisted into locals: these operations run once per
+        # glyph (or per point) on transform-heavy paths, and repeated slot
+        # attribute lookups are the dominant cost of the pure-Python arithmetic.
+        xx = m1.xx
+        xy = m1.xy
+        yx = m1.yx
+        yy = m1.yy
         if isinstance(m2, Matrix) :
             result = \
                 Matrix \
                   (
-                    xx = m1.xx * m2.xx + m1.xy * m2.yx,
-                    xy = m1.xx * m2.xy + m1.xy * m2.yy,
-                    yx = m1.yx * m2.xx + m1.yy * m2.yx,
-                    yy = m1.yx * m2.xy + m1.yy * m2.yy,
+                    xx * m2.xx + xy * m2.yx,
+                    xx * m2.xy + xy * m2.yy,
+                    yx * m2.xx + yy * m2.yx,
+                    yx * m2.xy + yy * m2.yy,
                   )
         elif isinstance(m2, Vector) :
+            x = m2.x
+            y = m2.y
             result = \
                 Vector \
                   (
-                    x = m1.xx * m2.x + m1.xy * m2.y,
-                    y = m1.yx * m2.x + m1.yy * m2.y,
+                    xx * x + xy * y,
+                    yx * x + yy * y,
                   )
         else :
             raise TypeError("Matrix can only multiply Vector or Matrix")
@@ -1698,14 +1822,18 @@ class Matrix :
 
     def inv(m) :
         "matrix inverse."
-        det = m.det()
+        xx = m.xx
+        xy = m.xy
+        yx = m.yx
+        yy = m.yy
+        det = xx * yy - xy * yx
         return \
             Matrix \
               (
-                xx = m.yy / det,
-                xy = - m.xy / det,
-                yx = - m.yx / det,
-                yy = m.xx / det,
+                yy / det,
+                - xy / det,
+                - yx / det,
+                xx / det,
               )
     #end inv
 
@@ -1795,7 +1923,7 @@ del ft_convs # my work is done
 # Note on need for weakrefs: some objects belong to a Library, but disposal
 # calls do not require an explicit reference to that Library. In this case
 # I keep a weakref to the Library as a check whether it has gone away or not.
-# Otherwise, __del__ methods are liable to segfault at script termination time.
+# Otherwise, cleanup callbacks are liable to segfault at script termination time.
 #-
 
 default_lib = None
@@ -1806,6 +1934,53 @@ got_lib_instances = False
 # instance. To avoid confusion, there are cross-checks to ensure the
 # two conventions cannot be mixed.
 
+#+
+# Cleanup callbacks, registered via weakref.finalize rather than __del__:
+# plain module-level functions taking just the low-level handle (and the
+# Library weakref where disposal needs it), so freeing an object doesn’t
+# go through the slower tp_finalize machinery, and the finalizers left at
+# interpreter exit run in a well-defined (newest-first) order.
+#-
+
+def _done_library(lib) :
+    if ft != None and lib.value != None :
+        ft.FT_Done_FreeType(lib)
+        lib.value = None
+    #end if
+#end _done_library
+
+def _done_face(ftobj, libref) :
+    if libref() != None :
+        # parent library might have vanished prematurely during program exit
+        check(ft.FT_Done_Face(ftobj))
+    #end if
+#end _done_face
+
+def _done_outline(ftobj, libref) :
+    lib = libref()
+    if lib != None :
+        check(_ft_outline_done(lib.lib, ftobj))
+    #end if
+#end _done_outline
+
+def _done_glyph(ftobj) :
+    ft.FT_Done_Glyph(ftobj)
+#end _done_glyph
+
+def _done_bitmap(ftobj, libref) :
+    lib = libref()
+    if lib != None :
+        check(ft.FT_Bitmap_Done(lib.lib, ftobj))
+    #end if
+#end _done_bitmap
+
+def _done_stroker(ftobj, lib, scratch) :
+    _ft_outline_done(lib, scratch)
+      # harmless if the scratch arrays were never allocated: freeing the
+      # null pointers in a zeroed outline record is a no-op
+    ft.FT_Stroker_Done(ftobj)
+#end _done_stroker
+
 def get_default_lib() :
     "returns the global default FreeType Library, automatically" \
     " creating it if it doesn’t exist."
@@ -1829,11 +2004,12 @@ class Library :
     "Use the new_face or find_face methods to open a font file and construct" \
     " a new Face object."
 
-    __slots__ = ("lib", "__weakref__") # to forestall typos
+    __slots__ = ("lib", "_version", "_finalize", "__weakref__") # to forestall typos
 
     def __init__(self) :
         global got_lib_instances
-        self.lib = ct.c_void_p(0) # do first for sake of destructor
+        self.lib = ct.c_void_p(0)
+        self._version = None
         if default_lib != None :
             raise RuntimeError \
               (
@@ -1841,25 +2017,24 @@ class Library :
               )
         #end if
         check(ft.FT_Init_FreeType(ct.byref(self.lib)))
+        self._finalize = weakref.finalize(self, _done_library, self.lib)
         got_lib_instances = True
     #end __init__
 
-    def __del__(self) :
-        if ft != None and self.lib.value != None :
-            ft.FT_Done_FreeType(self.lib)
-            self.lib.value = None
-        #end if
-    #end __del__
-
     @property
     def version(self) :
-        "the FreeType library version, as a triple of integers: (major, minor, patch)."
-        ver_major = ct.c_int()
-        ver_minor = ct.c_int()
-        ver_patch = ct.c_int()
-        ft.FT_Library_Version(self.lib, ct.byref(ver_major), ct.byref(ver_minor), ct.byref(ver_patch))
+        "the FreeType library version, as a triple of integers: (major, minor, patch)." \
+        " The result is fetched once and cached, since it cannot change for the" \
+        " lifetime of the library."
+        if self._version == None :
+            ver_major = ct.c_int()
+            ver_minor = ct.c_int()
+            ver_patch = ct.c_int()
+            ft.FT_Library_Version(self.lib, ct.byref(ver_major), ct.byref(ver_minor), ct.byref(ver_patch))
+            self._version = (ver_major.value, ver_minor.value, ver_patch.value)
+        #end if
         return \
-            (ver_major.value, ver_minor.value, ver_patch.value)
+            self._version
     #end version
 
     def new_face(self, filename, face_index = 0) :
@@ -1912,6 +2087,75 @@ class Library :
 
 #end Library
 
+_elt_struct_codes = \
+    {
+        ct.c_short : "h",
+        ct.c_ushort : "H",
+        ct.c_int : "i",
+        ct.c_uint : "I",
+        ct.c_long : "l",
+        ct.c_ulong : "L",
+    }
+
+def _def_elt_decoder(elt_type, exclude) :
+    # builds a bulk decoder for one array element of the given ctypes struct
+    # type: the whole element is pulled out with a single struct.unpack
+    # against a format precomputed from _fields_ (offsets included), rather
+    # than one ctypes descriptor access per field. Encoding fields are
+    # decoded to four-character tags and Pos fields to floats, matching
+    # struct_to_dict conventions elsewhere.
+    fmt = ""
+    fields = []
+    offset = 0
+    for name, t in elt_type._fields_ :
+        desc = getattr(elt_type, name)
+        if desc.offset > offset :
+            fmt += "%dx" % (desc.offset - offset)
+        #end if
+        fmt += _elt_struct_codes.get(t, "P") # pointer fields come out as ints
+        if name in exclude :
+            fields.append(None)
+        elif t is FT.Encoding :
+            fields.append((name, from_tag))
+        elif t is FT.Pos :
+            fields.append((name, from_f26_6))
+        else :
+            fields.append((name, None))
+        #end if
+        offset = desc.offset + desc.size
+    #end for
+    size = ct.sizeof(elt_type)
+    if size > offset :
+        fmt += "%dx" % (size - offset)
+    #end if
+    assert struct.calcsize(fmt) == size
+
+    def decode(adr) :
+        item = {}
+        for field, value in zip(fields, struct.unpack(fmt, ct.string_at(adr, size))) :
+            if field != None :
+                name, convert = field
+                if convert != None :
+                    value = convert(value)
+                #end if
+                item[name] = value
+            #end if
+        #end for
+        return \
+            item
+    #end decode
+
+#begin _def_elt_decoder
+    return \
+        decode
+#end _def_elt_decoder
+
+_face_elt_decoders = \
+    {
+        FT.Bitmap_Size : _def_elt_decoder(FT.Bitmap_Size, ()),
+        FT.CharMapRec : _def_elt_decoder(FT.CharMapRec, ("face",)),
+    }
+
 class Face :
     "represents an FT.Face. Do not instantiate directly; call the new or find" \
     " methods, or Library.new_face or Library.find_face instead."
@@ -1920,9 +2164,12 @@ class Face :
         (
             "__weakref__",
             "_ftobj", "_lib",
-            "filename", "family_name", "style_name",
+            "filename", "_family_name", "_style_name",
             "num_faces", "face_index", "face_flags", "style_flags", "num_glyphs",
-            "available_sizes", "charmaps",
+            "_available_sizes", "_charmaps",
+            "_metrics_cache", "_advance_scratch", "_advance_scratch_ref",
+            "_kern_scratch", "_kern_scratch_ref",
+            "_char_index_cache", "_finalize",
         ) # to forestall typos
 
     _instances = weakref.WeakValueDictionary()
@@ -1941,6 +2188,17 @@ class Face :
             self = super().__new__(celf)
             self._ftobj = ct.cast(face, FT.Face)
             self._lib = weakref.ref(lib)
+            self._finalize = weakref.finalize(self, _done_face, self._ftobj, self._lib)
+            self._metrics_cache = {}
+            self._char_index_cache = None
+            self._advance_scratch = FT.Fixed(0)
+            self._advance_scratch_ref = ct.byref(self._advance_scratch)
+              # reused by get_advance: one FT.Fixed + byref wrapper for the
+              # lifetime of the Face instead of a fresh pair per call
+            self._kern_scratch = FT.Vector()
+            self._kern_scratch_ref = ct.byref(self._kern_scratch)
+              # likewise for get_kerning; note these scratches make the Face
+              # methods non-reentrant, which they already weren’t
             facerec = self._ftobj.contents
             self.filename = filename
             # following attrs don't change, but perhaps it is simpler to define them
@@ -1958,52 +2216,14 @@ class Face :
             :
                 setattr(self, field, getattr(facerec, field))
             #end for
-            for \
-                field \
-            in \
-                (
-                    "family_name",
-                    "style_name",
-                ) \
-            :
-                setattr(self, field, getattr(facerec, field).decode("utf-8"))
-            #end for
             # end attributes which could go into def_extra_fields call
-            for \
-                nr_field, ptr_field, elt_type, deref, exclude \
-            in \
-                (
-                    ("num_fixed_sizes", "available_sizes", FT.Bitmap_Size, False, ()),
-                    ("num_charmaps", "charmaps", FT.CharMapRec, True, ("face",)),
-                ) \
-            :
-                nr_items = getattr(facerec, nr_field)
-                elts = getattr(facerec, ptr_field)
-                items = []
-                for i in range(nr_items) :
-                    elt = elts[i]
-                    if deref :
-                        elt = elt.contents
-                    #end if
-                    item = {}
-                    for k in elt_type._fields_ :
-                        k, t = k
-                        if k not in exclude :
-                            item[k] = getattr(elt, k)
-                            if t is FT.Encoding :
-                                item[k] = from_tag(item[k])
-                            elif t is FT.Pos :
-                                item[k] = from_f26_6(item[k])
-                            #end if
-                        #end if
-                    #end for
-                    if deref :
-                        item["."] = elts[i]
-                    #end if
-                    items.append(item)
-                #end for
-                setattr(self, ptr_field, items)
-            #end for
+            # name strings, charmaps and fixed sizes are decoded on first
+            # access rather than here: callers that just load glyphs never
+            # pay for them
+            self._family_name = None
+            self._style_name = None
+            self._available_sizes = None
+            self._charmaps = None
             celf._instances[face.value] = self
         else :
             assert \
@@ -2016,14 +2236,6 @@ class Face :
             self
     #end __new__
 
-    def __del__(self) :
-        if self._ftobj != None and self._lib() != None :
-            # self._lib might have vanished prematurely during program exit
-            check(ft.FT_Done_Face(self._ftobj))
-            self._ftobj = None
-        #end if
-    #end __del__
-
     @staticmethod
     def new(filename, face_index = 0) :
         "loads an FT.Face from a file and returns a Face object for it."
@@ -2039,11 +2251,81 @@ class Face :
             get_default_lib().find_face(pattern)
     #end find
 
+    @property
+    def family_name(self) :
+        "the face’s family name, decoded on first access."
+        result = self._family_name
+        if result == None :
+            result = sys.intern(self._ftobj.contents.family_name.decode("utf-8"))
+            self._family_name = result
+        #end if
+        return \
+            result
+    #end family_name
+
+    @property
+    def style_name(self) :
+        "the face’s style name, decoded on first access."
+        result = self._style_name
+        if result == None :
+            result = sys.intern(self._ftobj.contents.style_name.decode("utf-8"))
+            self._style_name = result
+        #end if
+        return \
+            result
+    #end style_name
+
+    def _decode_elt_list(self, nr_field, ptr_field, elt_type, deref) :
+        # common decode loop for the available_sizes and charmaps arrays
+        facerec = self._ftobj.contents
+        nr_items = getattr(facerec, nr_field)
+        elts = getattr(facerec, ptr_field)
+        decode = _face_elt_decoders[elt_type]
+        items = []
+        for i in range(nr_items) :
+            elt = elts[i]
+            if deref :
+                elt = elt.contents
+            #end if
+            item = decode(ct.addressof(elt))
+            if deref :
+                item["."] = elts[i]
+            #end if
+            items.append(item)
+        #end for
+        return \
+            items
+    #end _decode_elt_list
+
+    @property
+    def available_sizes(self) :
+        "list of dicts describing the face’s fixed bitmap strikes, decoded on first access."
+        result = self._available_sizes
+        if result == None :
+            result = self._decode_elt_list("num_fixed_sizes", "available_sizes", FT.Bitmap_Size, False)
+            self._available_sizes = result
+        #end if
+        return \
+            result
+    #end available_sizes
+
+    @property
+    def charmaps(self) :
+        "list of dicts describing the face’s charmaps, decoded on first access."
+        result = self._charmaps
+        if result == None :
+            result = self._decode_elt_list("num_charmaps", "charmaps", FT.CharMapRec, True)
+            self._charmaps = result
+        #end if
+        return \
+            result
+    #end charmaps
+
     @property
     def font_format(self) :
         "the font format."
         return \
-            ft.FT_Get_X11_Font_Format(self._ftobj).decode("utf-8")
+            sys.intern(ft.FT_Get_X11_Font_Format(self._ftobj).decode("utf-8"))
     #end font_format
 
     @property
@@ -2080,11 +2362,13 @@ class Face :
 
     def select_charmap(self, encoding) :
         check(ft.FT_Select_Charmap(self._ftobj, encoding))
+        self._char_index_cache = None
     #end select_charmap
 
     def set_charmap(self, charmap) :
         "charmap should be an element of self.charmaps"
         check(ft.FT_Set_Charmap(self._ftobj, charmap["."]))
+        self._char_index_cache = None
     #end set_charmap
 
     def get_charmap_index(self, charmap) :
@@ -2125,19 +2409,23 @@ class Face :
             horz_resolution,
             vert_resolution,
           ))
+        self._metrics_cache.clear()
     #end set_char_size
 
     def set_pixel_sizes(self, pixel_width, pixel_height) :
         check(ft.FT_Set_Pixel_Sizes(self._ftobj, int(pixel_width), int(pixel_height)))
+        self._metrics_cache.clear()
     #end set_pixel_sizes
 
     def request_size(self, reqtype, width, height, horiResolution, vertResolution) :
         req = FT.Size_RequestRec(int(reqtype), int(width), int(height), to_f26_6(horiResolution), to_f26_6(vertResolution))
         check(ft.FT_Request_Size(self._ftobj, ct.byref(req)))
+        self._metrics_cache.clear()
     #end request_size
 
     def select_size(self, strike_index) :
         check(ft.FT_Select_Size(self._ftobj, int(strike_index)))
+        self._metrics_cache.clear()
     #end select_size
 
     def set_transform(self, matrix, delta) :
@@ -2145,43 +2433,101 @@ class Face :
         ftmat = matrix.to_ft()
         ftdelta = delta.to_ft_f26_6() # this is a guess
         ft.FT_Set_Transform(self._ftobj, ct.byref(ftmat), ct.byref(ftdelta))
+        self._metrics_cache.clear()
     #end set_transform
 
     def char_glyphs(self) :
         "generator which yields successive (char_code, glyph_code) pairs defined for" \
         " the current charmap."
-        glyph_index = ct.c_uint(0)
-        char_code = ft.FT_Get_First_Char(self._ftobj, ct.byref(glyph_index))
-        while glyph_index.value != 0 :
-            yield char_code, glyph_index.value
-            char_code = ft.FT_Get_Next_Char(self._ftobj, char_code, ct.byref(glyph_index))
-        #end while
+        table = self._char_index_cache
+        if table != None :
+            # the charmap has been enumerated before (here or in
+            # get_char_index): replay the cached table, which preserves
+            # charmap order, with no further FT calls
+            yield from table.items()
+        else :
+            # the byref argument and the objects consulted each iteration are
+            # created/bound once up front: enumerating a full Unicode charmap
+            # is thousands of calls, and this loop is pure FFI overhead.
+            ftobj = self._ftobj
+            glyph_index = ct.c_uint(0)
+            glyph_index_ref = ct.byref(glyph_index)
+            get_next_char = _ft_get_next_char
+            table = {}
+            char_code = _ft_get_first_char(ftobj, glyph_index_ref)
+            gindex = glyph_index.value
+            while gindex != 0 :
+                # read the ctypes descriptor once per iteration, not three times
+                table[char_code] = gindex
+                yield char_code, gindex
+                char_code = get_next_char(ftobj, char_code, glyph_index_ref)
+                gindex = glyph_index.value
+            #end while
+            # only a completed walk may be cached; an abandoned generator
+            # never gets here
+            self._char_index_cache = table
+        #end if
     #end char_glyphs
 
     def get_char_index(self, charcode) :
+        # the whole charmap is enumerated on first use and lookups served from
+        # the resulting dict, replacing an FT_Get_Char_Index call per character
+        # with a hash probe; the table is discarded when the charmap changes.
+        table = self._char_index_cache
+        if table == None :
+            table = dict(self.char_glyphs())
+            self._char_index_cache = table
+        #end if
         return \
-            ft.FT_Get_Char_Index(self._ftobj, charcode)
+            table.get(charcode, 0)
     #end get_char_index
 
     def load_glyph(self, glyph_index, load_flags) :
-        check(ft.FT_Load_Glyph(self._ftobj, glyph_index, load_flags))
+        # status check is inlined: one comparison on the (overwhelmingly
+        # common) success path, no extra call into check().
+        sts = _ft_load_glyph(self._ftobj, glyph_index, load_flags)
+        if sts != 0 :
+            raise FTException(sts)
+        #end if
     #end load_glyph
 
     def load_char(self, char_code, load_flags) :
-        check(ft.FT_Load_Char(self._ftobj, char_code, load_flags))
+        sts = _ft_load_char(self._ftobj, char_code, load_flags)
+        if sts != 0 :
+            raise FTException(sts)
+        #end if
     #end load_char
 
+    def get_glyph_metrics(self, glyph_index, load_flags) :
+        "returns the decoded Glyph_Metrics dict for the specified glyph, loading" \
+        " the glyph if necessary. Results are cached per (glyph index, load flags)" \
+        " until the next size or transform change, so repeated layout passes over" \
+        " the same text avoid redundant FT_Load_Glyph calls and struct decodes."
+        key = (glyph_index, load_flags)
+        result = self._metrics_cache.get(key)
+        if result == None :
+            check(_ft_load_glyph(self._ftobj, glyph_index, load_flags))
+            result = struct_to_dict \
+              (
+                self._ftobj.contents.glyph.contents.metrics,
+                FT.Glyph_Metrics,
+                False,
+                {None : from_f26_6}
+              )
+            self._metrics_cache[key] = result
+        #end if
+        return \
+            result
+    #end get_glyph_metrics
+
     def glyph_slots(self) :
         "generator which yields each element of the linked list of glyph slots in turn."
         glyph = self._ftobj.contents.glyph
-        while True :
+        while ct.cast(glyph, ct.c_void_p).value != None :
+            # explicit null test: cheaper than provoking and catching the
+            # ValueError from a null dereference, and it can’t mask a real one
             yield GlyphSlot(glyph)
-            try :
-                glyph = glyph.contents.next
-                _ = glyph.contents # check it's not just wrapping a null pointer
-            except ValueError : # assume because of NULL pointer access
-                break
-            #end try
+            glyph = glyph.contents.next
         #end while
     #end glyph_slots
 
@@ -2193,36 +2539,56 @@ class Face :
     #end glyph
 
     def get_kerning(self, left_glyph, right_glyph, kern_mode) :
-        result = FT.Vector()
-        check(ft.FT_Get_Kerning(self._ftobj, left_glyph, right_glyph, kern_mode, ct.byref(result)))
+        result = self._kern_scratch
+        check(_ft_get_kerning(self._ftobj, left_glyph, right_glyph, kern_mode, self._kern_scratch_ref))
+        # the f26.6 decode is done inline with a folded constant: this runs
+        # once per adjacent glyph pair in a shaping loop
         if self._ftobj.contents.face_flags & FT.FACE_FLAG_SCALABLE != 0 and kern_mode != FT.KERNING_UNSCALED :
-            result = Vector.from_ft_f26_6(result)
+            result = Vector(result.x * (1 / 64), result.y * (1 / 64))
         else :
-            result = Vector.from_ft_int(result)
+            result = Vector(result.x, result.y)
         #end if
         return \
             result
     #end get_kerning
 
     def get_track_kerning(self, point_size, degree) :
-        result = FT.Fixed(0)
-        check(ft.FT_Get_Track_Kerning(self._ftobj, to_f16_16(point_size), degree, ct.byref(result)))
+        result = self._advance_scratch # same shape of scratch as get_advance
+        check(ft.FT_Get_Track_Kerning(self._ftobj, to_f16_16(point_size), degree, self._advance_scratch_ref))
         return \
             from_f26_6(result.value)
     #end get_track_kerning
 
     def get_advance(self, gindex, load_flags) :
-        result = FT.Fixed(0)
-        check(ft.FT_Get_Advance(self._ftobj, gindex, load_flags, ct.byref(result)))
+        sts = _ft_get_advance(self._ftobj, gindex, load_flags, self._advance_scratch_ref)
+        if sts != 0 :
+            raise FTException(sts)
+        #end if
+        result = self._advance_scratch.value
+        if load_flags & FT.LOAD_NO_SCALE == 0 :
+            result *= 1 / 65536 # constant is folded: no converter call per advance
+        #end if
         return \
-            (from_f16_16, int)[load_flags & FT.LOAD_NO_SCALE != 0](result.value)
+            result
     #end get_advance
 
     def get_advances(self, start, count, load_flags) :
         result = (count * FT.Fixed)()
-        check(ft.FT_Get_Advances(self._ftobj, start, count, load_flags, ct.byref(result)))
+        sts = _ft_get_advances(self._ftobj, start, count, load_flags, ct.byref(result))
+        if sts != 0 :
+            raise FTException(sts)
+        #end if
+        # ctypes already yields the elements as plain ints; scale inline
+        # rather than through a Python function call per element, since this
+        # runs once per glyph of a shaping run.
+        if load_flags & FT.LOAD_NO_SCALE != 0 :
+            decoded = tuple(result)
+        else :
+            recip = 1 / 65536
+            decoded = tuple(item * recip for item in result)
+        #end if
         return \
-            tuple((from_f16_16, int)[load_flags & FT.LOAD_NO_SCALE != 0](item) for item in result)
+            decoded
     #end get_advances
 
     def get_glyph_name(self, glyph_index) :
@@ -2425,13 +2791,15 @@ class Face :
 
     def load_sfnt_table(self, tag, offset = 0, length = None) :
         "returns the (specified part of the) contents of the sfnt table with the given" \
-        " tag, as a Python array object."
+        " tag, as a bytearray."
         c_length = ct.c_ulong()
         while True :
             if length != None :
                 assert offset <= length
-                buffer = array.array("B", (0,) * (length - offset))
-                bufadr = buffer.buffer_info()[0]
+                buffer = bytearray(length - offset)
+                  # zero-filled in one C allocation, and FreeType writes into
+                  # it directly via from_buffer, no copying
+                bufadr = ct.addressof((ct.c_ubyte * len(buffer)).from_buffer(buffer))
                 c_length.value = length
             else :
                 bufadr = None
@@ -2566,21 +2934,23 @@ class GlyphSlot :
     "represents an FT.GlyphSlotRec. Do not instantiate directly;" \
     " call Face.glyph_slots or access via Face.glyph and GlyphSlot.next links instead."
 
-    __slots__ = ("_ftobj",) # to forestall typos
+    __slots__ = ("_ftobj", "_outline_wrap", "_bitmap_wrap") # to forestall typos
 
     def __init__(self, ftobj) :
         self._ftobj = ftobj
+        self._outline_wrap = None
+        self._bitmap_wrap = None
     #end __init__
 
     @property
     def next(self) :
         "link to next GlyphSlot, if any."
-        try :
-            result = GlyphSlot(self._ftobj.contents.next)
-            _ = result.advance # check it's not just wrapping a null pointer
-        except ValueError : # assume because of NULL pointer access
+        nextobj = self._ftobj.contents.next
+        if ct.cast(nextobj, ct.c_void_p).value != None :
+            result = GlyphSlot(nextobj)
+        else :
             result = None
-        #end try
+        #end if
         return \
             result
     #end def
@@ -2589,21 +2959,37 @@ class GlyphSlot :
     def outline(self) :
         "the Outline, if format = FT.GLYPH_FORMAT_OUTLINE."
         assert self._ftobj.contents.format == FT.GLYPH_FORMAT_OUTLINE
+        # the outline record sits at a fixed address within the slot for the
+        # life of the slot, so the wrapper (and its ct.pointer) can be built
+        # once and reused across load_glyph calls
+        result = self._outline_wrap
+        if result == None :
+            result = Outline(ct.pointer(self._ftobj.contents.outline), self, None)
+            self._outline_wrap = result
+        #end if
         return \
-            Outline(ct.pointer(self._ftobj.contents.outline), self, None)
+            result
     #end outline
 
     def render_glyph(self, render_mode) :
         "renders the loaded glyph to a bitmap."
-        check(ft.FT_Render_Glyph(self._ftobj, render_mode))
+        sts = _ft_render_glyph(self._ftobj, render_mode)
+        if sts != 0 :
+            raise FTException(sts)
+        #end if
     #end render_glyph
 
     @property
     def bitmap(self) :
         "the Bitmap, if format = FT.GLYPH_FORMAT_BITMAP."
         assert self._ftobj.contents.format == FT.GLYPH_FORMAT_BITMAP
+        result = self._bitmap_wrap
+        if result == None :
+            result = Bitmap(ct.pointer(self._ftobj.contents.bitmap), self, None)
+            self._bitmap_wrap = result
+        #end if
         return \
-            Bitmap(ct.pointer(self._ftobj.contents.bitmap), self, None)
+            result
     #end bitmap
 
     @property
@@ -2629,7 +3015,7 @@ class GlyphSlot :
 
     def get_glyph(self) :
         result = FT.Glyph()
-        check(ft.FT_Get_Glyph(self._ftobj, ct.byref(result)))
+        check(_ft_get_glyph(self._ftobj, ct.byref(result)))
         return \
             Glyph(result)
     #end get_glyph
@@ -2639,6 +3025,8 @@ class GlyphSlot :
         " index, flags, arg1 and arg2 are integers, while transform is a Matrix." \
         " See FT.SUBGLYPH_FLAG_XXX for flags bits."
 
+        __slots__ = ("index", "flags", "arg1", "arg2", "transform") # to forestall typos
+
         def __init__(self, index, flags, arg1, arg2, transform) :
             self.index = index
             self.flags = flags
@@ -2710,14 +3098,20 @@ CURVEPT_ON = 1 # on-curve (corner)
 CURVEPT_OFF2 = 0 # off-curve (quadratic Bézier segment)
 CURVEPT_OFF3 = 2 # off-curve (cubic Bézier segment)
 
+_sizeof_vector = ct.sizeof(FT.Vector)
+_sizeof_short = ct.sizeof(ct.c_short)
+  # computed once, for the outline array-copying paths
+
 class Outline :
     "Pythonic representation of an FT.Outline. Get one of these from" \
     " GlyphSlot.outline, Glyph.outline or Outline.new()."
 
-    __slots__ = ("_ftobj", "_lib", "owner") # to forestall typos
+    __slots__ = ("__weakref__", "_ftobj", "_lib", "owner", "_finalize", "_bbox_scratch") # to forestall typos
 
     def __init__(self, ftobj, owner, lib) :
         self._ftobj = ftobj
+        self._finalize = None
+        self._bbox_scratch = None # created on first cbox/bbox query
         assert (owner != None) != (lib != None)
         if owner != None :
             self.owner = owner # keep a strong ref to ensure it doesn’t disappear unexpectedly
@@ -2725,18 +3119,10 @@ class Outline :
         else :
             self.owner = None
             self._lib = weakref.ref(lib)
+            self._finalize = weakref.finalize(self, _done_outline, ftobj, self._lib)
         #end if
     #end __init__
 
-    def __del__(self) :
-        if self.owner == None and self._lib != None and self._lib() != None :
-            if self._ftobj != None :
-                check(ft.FT_Outline_Done(self._lib().lib, self._ftobj))
-                self._ftobj = None
-            #end if
-        #end if
-    #end __del__
-
     # wrappers for outline-processing functions
     # <http://www.freetype.org/freetype2/docs/reference/ft2-outline_processing.html>
 
@@ -2749,7 +3135,7 @@ class Outline :
             raise TypeError("expecting a Library")
         #end if
         result = ct.pointer(FT.Outline())
-        check(ft.FT_Outline_New(lib.lib, 0, 0, result))
+        check(_ft_outline_new(lib.lib, 0, 0, result))
         return \
             Outline(result, None, lib)
     #end new
@@ -2764,12 +3150,12 @@ class Outline :
     #end copy
 
     def translate(self, x_offset, y_offset) :
-        ft.FT_Outline_Translate(self._ftobj, to_f26_6(x_offset), to_f26_6(y_offset))
+        _ft_outline_translate(self._ftobj, round(x_offset * 64), round(y_offset * 64))
     #end translate
 
     def transform(self, matrix) :
         "transforms the Outline by the specified Matrix."
-        ft.FT_Outline_Transform(self._ftobj, ct.byref(matrix.to_ft()))
+        _ft_outline_transform(self._ftobj, ct.byref(matrix.to_ft()))
     #end transform
 
     def embolden(self, strength) :
@@ -2792,18 +3178,30 @@ class Outline :
         check(ft.FT_Outline_Check(self._ftobj))
     #end check
 
+    def _get_bbox_scratch(self) :
+        # one FT.BBox per Outline, shared by the cbox/bbox queries, instead
+        # of a fresh ctypes allocation per call
+        result = self._bbox_scratch
+        if result == None :
+            result = FT.BBox()
+            self._bbox_scratch = result
+        #end if
+        return \
+            result
+    #end _get_bbox_scratch
+
     def get_cbox(self) :
         "returns the Outline’s control box, which encloses all the control points."
-        result = FT.BBox()
-        ft.FT_Outline_Get_CBox(self._ftobj, ct.byref(result))
+        result = self._get_bbox_scratch()
+        _ft_outline_get_cbox(self._ftobj, ct.byref(result))
         return \
             BBox.from_ft_f26_6(result)
     #end get_cbox
 
     def get_bbox(self) :
         "returns the Outline’s bounding box, which encloses the entire glyph."
-        result = FT.BBox()
-        check(ft.FT_Outline_Get_BBox(self._ftobj, ct.byref(result)))
+        result = self._get_bbox_scratch()
+        check(_ft_outline_get_bbox(self._ftobj, ct.byref(result)))
         return \
             BBox.from_ft_f26_6(result)
     #end get_bbox
@@ -2872,30 +3270,62 @@ class Outline :
 
     # end of wrappers for outline-processing functions
 
+    def get_points(self) :
+        "returns the control points and tags of the Outline decoded in bulk, as" \
+        " a pair (points, tags): points is a list of Vectors with coordinates" \
+        " interpreted as f26.6, and tags is a bytes object of the corresponding" \
+        " point flags. This reads the underlying arrays in two C calls rather" \
+        " than one ctypes dereference per point."
+        ftobj = self._ftobj.contents
+        n = ftobj.n_points
+        if n != 0 :
+            coords = struct.unpack \
+              (
+                "%dl" % (2 * n),
+                ct.string_at(ftobj.points, n * ct.sizeof(FT.Vector))
+              )
+            tags = ct.string_at(ftobj.tags, n)
+            points = list(Vector(coords[i] / 64, coords[i + 1] / 64) for i in range(0, 2 * n, 2))
+        else :
+            points = []
+            tags = b""
+        #end if
+        return \
+            (points, tags)
+    #end get_points
+
     @property
     def contours(self) :
         "a tuple of the contours of the outline. Each element is a tuple of curve" \
         " points, each in turn being a triple (coord : Vector, point_type : CURVEPT, dropout_flags : int)."
-        result = []
-        pointindex = 0
         ftobj = self._ftobj.contents
-        for contourindex in range(ftobj.n_contours) :
-            contour = []
-            endpoint = ftobj.contours[contourindex]
-            while True :
-                if pointindex == ftobj.n_points :
-                    raise IndexError("contour point index has run off the end")
-                #end if
-                point = ftobj.points[pointindex]
-                flag = ftobj.tags[pointindex]
-                pt_type = flag & 3
-                contour.append((Vector.from_ft_f26_6(point), pt_type, flag >> 32))
-                  # interpreting coords as f26.6 is a guess
-                if pointindex == endpoint :
-                    break
-                pointindex += 1
-            #end while
-            result.append(tuple(contour))
+        nr_contours = ftobj.n_contours
+        points, tags = self.get_points()
+          # interpreting coords as f26.6 is a guess
+        if nr_contours != 0 :
+            endpoints = struct.unpack \
+              (
+                "%dh" % nr_contours,
+                ct.string_at(ftobj.contours, nr_contours * ct.sizeof(ct.c_short))
+              )
+        else :
+            endpoints = ()
+        #end if
+        result = []
+        start = 0
+        for endpoint in endpoints :
+            if endpoint >= len(points) :
+                raise IndexError("contour point index has run off the end")
+            #end if
+            result.append \
+              (
+                tuple
+                  (
+                    (points[i], tags[i] & 3, tags[i] >> 5 & 7)
+                    for i in range(start, endpoint + 1)
+                  )
+              )
+            start = endpoint + 1
         #end for
         return \
             tuple(result)
@@ -2908,69 +3338,176 @@ class Outline :
         " meaning of arg is up to you. Each action must return a status, 0 for success." \
         " If conic_to is None, then cubic_to will be called for conic segments with" \
         " control points suitably calculated to produce the right quadratic curve."
+        # This walks the point/tag/contour arrays directly in Python, following
+        # the same segment-assembly rules as FT_Outline_Decompose; going through
+        # the C routine would cost a ctypes callback trampoline plus a Vector
+        # struct decode for every segment.
 
         pos0 = None
-        from_ft = Vector.from_ft_f26_6
 
-        def wrap_move_to(pos, _) :
-            pos = from_ft(pos.contents)
-            if conic_to == None :
-                nonlocal pos0
-                pos0 = pos
-            #end if
-            return \
-                move_to(pos, arg)
-        #end wrap_move_to
+        if conic_to != None :
 
-        def wrap_line_to(pos, _) :
-            pos = from_ft(pos.contents)
-            if conic_to == None :
-                nonlocal pos0
-                pos0 = pos
-            #end if
-            return \
-                line_to(pos, arg)
-        #end wrap_line_to
-
-        def wrap_conic_to(qpos1, qpos2, _) :
-            if conic_to != None :
-                pos1 = from_ft(qpos1.contents)
-                pos2 = from_ft(qpos2.contents)
-                result = conic_to(pos1, pos2, arg)
-            else :
+            def emit_conic(pos1, pos2) :
+                return \
+                    conic_to(pos1, pos2, arg)
+            #end emit_conic
+
+        else :
+
+            def emit_conic(midpos, pos3) :
                 nonlocal pos0
-                midpos = from_ft(qpos1.contents)
-                pos3 = from_ft(qpos2.contents)
                 # quadratic-to-cubic conversion taken from
-                # <http://stackoverflow.com/questions/3162645/convert-a-quadratic-bezier-to-a-cubic>
-                pos1 = pos0 + 2 * (midpos - pos0) / 3
-                pos2 = pos3 + 2 * (midpos - pos3) / 3
+                # <http://stackoverflow.com/questions/3162645/convert-a-quadratic-bezier-to-a-cubic>,
+                # done on the scalar components: the Vector operator forms
+                # allocate several intermediate Vectors per conversion.
+                mx = midpos.x
+                my = midpos.y
+                qx = pos3.x
+                qy = pos3.y
+                pos1 = Vector(pos0.x + 2 * (mx - pos0.x) / 3, pos0.y + 2 * (my - pos0.y) / 3)
+                pos2 = Vector(qx + 2 * (mx - qx) / 3, qy + 2 * (my - qy) / 3)
                 result = cubic_to(pos1, pos2, pos3, arg)
-                pos0 = pos2
-            #end if
-            return \
-                result
-        #end wrap_conic_to
+                pos0 = pos3
+                return \
+                    result
+            #end emit_conic
 
-        def wrap_cubic_to(pos1, pos2, pos3, _) :
-            pos1 = from_ft(pos1.contents)
-            pos2 = from_ft(pos2.contents)
-            pos3 = from_ft(pos3.contents)
-            return \
-                cubic_to(pos1, pos2, pos3, arg)
-        #end wrap_cubic_to
+        #end if
 
     #begin decompose
-        funcs = FT.Outline_Funcs \
-          (
-            move_to = FT.Outline_MoveToFunc(wrap_move_to),
-            line_to = FT.Outline_LineToFunc(wrap_line_to),
-            conic_to = FT.Outline_ConicToFunc(wrap_conic_to),
-            cubic_to = FT.Outline_CubicToFunc(wrap_cubic_to),
-            shift = shift,
-            delta = delta,
-          )
-        check(ft.FT_Outline_Decompose(self._ftobj, ct.byref(funcs), ct.c_void_p(0)))
+        ftobj = self._ftobj.contents
+        nr_points = ftobj.n_points
+        nr_contours = ftobj.n_contours
+        if nr_points != 0 :
+            coords = struct.unpack \
+              (
+                "%dl" % (2 * nr_points),
+                ct.string_at(ftobj.points, nr_points * _sizeof_vector)
+              )
+            tags = ct.string_at(ftobj.tags, nr_points)
+        else :
+            coords = ()
+            tags = b""
+        #end if
+        if nr_contours != 0 :
+            endpoints = struct.unpack \
+              (
+                "%dh" % nr_contours,
+                ct.string_at(ftobj.contours, nr_contours * _sizeof_short)
+              )
+        else :
+            endpoints = ()
+        #end if
+        if shift != 0 or delta != 0 :
+            coords = tuple((c << shift) - delta for c in coords)
+        #end if
+        recip = 1 / 64
+        points = tuple \
+            (Vector(coords[i] * recip, coords[i + 1] * recip) for i in range(0, 2 * nr_points, 2))
+        first = 0
+        for endpoint in endpoints :
+            last = endpoint
+            if last < first or last >= nr_points :
+                raise FTException(Error.Invalid_Outline)
+            #end if
+            start_tag = tags[first] & 3
+            if start_tag == CURVEPT_OFF3 :
+                raise FTException(Error.Invalid_Outline)
+            #end if
+            if start_tag == CURVEPT_OFF2 :
+                if tags[last] & 3 == CURVEPT_ON :
+                    # start at the last point if it is on the curve
+                    v_start = points[last]
+                    last -= 1
+                else :
+                    # both first and last points are off the curve: start at their
+                    # middle, halved in integer f26.6 space with truncation toward
+                    # zero to match the C integer division in FT_Outline_Decompose
+                    sx = coords[2 * first] + coords[2 * last]
+                    sy = coords[2 * first + 1] + coords[2 * last + 1]
+                    v_start = Vector \
+                      (
+                        (sx // 2, - (- sx // 2))[sx < 0] * recip,
+                        (sy // 2, - (- sy // 2))[sy < 0] * recip
+                      )
+                #end if
+                i = first
+            else :
+                v_start = points[first]
+                i = first + 1
+            #end if
+            pos0 = v_start
+            status = move_to(v_start, arg)
+            closed = False
+            while status == 0 and i <= last :
+                tag = tags[i] & 3
+                if tag == CURVEPT_ON :
+                    pos0 = points[i]
+                    status = line_to(pos0, arg)
+                    i += 1
+                elif tag == CURVEPT_OFF2 :
+                    v_control = points[i]
+                    ctrl = i
+                    i += 1
+                    while True :
+                        if i > last :
+                            status = emit_conic(v_control, v_start)
+                            closed = True
+                            break
+                        #end if
+                        next_tag = tags[i] & 3
+                        if next_tag == CURVEPT_ON :
+                            status = emit_conic(v_control, points[i])
+                            i += 1
+                            break
+                        #end if
+                        if next_tag != CURVEPT_OFF2 :
+                            raise FTException(Error.Invalid_Outline)
+                        #end if
+                        # implied on-curve point: halved in integer f26.6 space
+                        # with truncation toward zero, matching the C integer
+                        # division in FT_Outline_Decompose
+                        sx = coords[2 * ctrl] + coords[2 * i]
+                        sy = coords[2 * ctrl + 1] + coords[2 * i + 1]
+                        v_middle = Vector \
+                          (
+                            (sx // 2, - (- sx // 2))[sx < 0] * recip,
+                            (sy // 2, - (- sy // 2))[sy < 0] * recip
+                          )
+                        status = emit_conic(v_control, v_middle)
+                        if status != 0 :
+                            break
+                        #end if
+                        v_control = points[i]
+                        ctrl = i
+                        i += 1
+                    #end while
+                else : # CURVEPT_OFF3
+                    if i + 1 > last or tags[i + 1] & 3 != CURVEPT_OFF3 :
+                        raise FTException(Error.Invalid_Outline)
+                    #end if
+                    pos1 = points[i]
+                    pos2 = points[i + 1]
+                    i += 2
+                    if i <= last :
+                        pos3 = points[i]
+                        i += 1
+                    else :
+                        pos3 = v_start
+                        closed = True
+                    #end if
+                    pos0 = pos3
+                    status = cubic_to(pos1, pos2, pos3, arg)
+                #end if
+            #end while
+            if status == 0 and not closed :
+                status = line_to(v_start, arg)
+            #end if
+            if status != 0 :
+                raise FTException(status)
+            #end if
+            first = endpoint + 1
+        #end for
     #end decompose
 
     def draw(self, g) :
@@ -3010,58 +3547,67 @@ class Outline :
 
     def _append(self, that) :
         # appends the contours from FT.Outline that onto this one, extending the arrays appropriately.
-        assert self._lib() != None, "parent Library has gone"
-        this_nr_contours = self._ftobj.contents.n_contours
-        this_nr_points = self._ftobj.contents.n_points
-        that_nr_contours = that.contents.n_contours
-        that_nr_points = that.contents.n_points
+        lib = self._lib()
+        assert lib != None, "parent Library has gone"
+        this = self._ftobj.contents
+        that = that.contents
+        this_nr_contours = this.n_contours
+        this_nr_points = this.n_points
+        that_nr_contours = that.n_contours
+        that_nr_points = that.n_points
         result = ct.pointer(FT.Outline())
-        check(ft.FT_Outline_New
+        check(_ft_outline_new
           (
-            self._lib().lib,
+            lib.lib,
             this_nr_points + that_nr_points,
             this_nr_contours + that_nr_contours,
             result
           ))
-        ct.memmove \
-          (
-            result.contents.points,
-            self._ftobj.contents.points,
-            this_nr_points * ct.sizeof(FT.Vector)
-          )
-        ct.memmove \
-          (
-            ct.cast(result.contents.points, ct.c_void_p).value + this_nr_points * ct.sizeof(FT.Vector),
-            that.contents.points,
-            that_nr_points * ct.sizeof(FT.Vector)
-          )
-        ct.memmove \
-          (
-            result.contents.tags,
-            self._ftobj.contents.tags,
-            this_nr_points * ct.sizeof(ct.c_ubyte)
-          )
-        ct.memmove \
-          (
-            ct.cast(result.contents.tags, ct.c_void_p).value + this_nr_points * ct.sizeof(ct.c_ubyte),
-            that.contents.tags,
-            that_nr_points * ct.sizeof(ct.c_ubyte)
-          )
-        ct.memmove \
-          (
-            result.contents.contours,
-            self._ftobj.contents.contours,
-            this_nr_contours * ct.sizeof(ct.c_short)
-          )
-        ct.memmove \
-          (
-            ct.cast(result.contents.contours, ct.c_void_p).value + this_nr_contours * ct.sizeof(ct.c_short),
-            that.contents.contours,
-            that_nr_contours * ct.sizeof(ct.c_short)
-          )
-        result.contents.flags = self._ftobj.contents.flags # good enough?
-        check(ft.FT_Outline_Done(self._lib().lib, self._ftobj))
+        res = result.contents
+        if this_nr_points + that_nr_points != 0 :
+            # destination offsets are computed with plain addressof arithmetic,
+            # one base address per array, instead of a cast-to-c_void_p dance
+            # per copy
+            dst_points = ct.addressof(res.points.contents)
+            ct.memmove(dst_points, this.points, this_nr_points * _sizeof_vector)
+            ct.memmove \
+              (
+                dst_points + this_nr_points * _sizeof_vector,
+                that.points,
+                that_nr_points * _sizeof_vector
+              )
+            dst_tags = ct.addressof(res.tags.contents)
+            ct.memmove(dst_tags, this.tags, this_nr_points)
+            ct.memmove(dst_tags + this_nr_points, that.tags, that_nr_points)
+        #end if
+        if this_nr_contours + that_nr_contours != 0 :
+            dst_contours = ct.addressof(res.contours.contents)
+            ct.memmove(dst_contours, this.contours, this_nr_contours * _sizeof_short)
+            if that_nr_contours != 0 :
+                # the appended endpoint indices must be rebased past the points
+                # already present
+                rebased = struct.pack \
+                  (
+                    "%dh" % that_nr_contours,
+                    *(
+                        e + this_nr_points
+                        for e in struct.unpack
+                          (
+                            "%dh" % that_nr_contours,
+                            ct.string_at(that.contours, that_nr_contours * _sizeof_short)
+                          )
+                    )
+                  )
+                ct.memmove(dst_contours + this_nr_contours * _sizeof_short, rebased, that_nr_contours * _sizeof_short)
+            #end if
+        #end if
+        res.flags = this.flags # good enough?
+        if self._finalize != None :
+            self._finalize.detach()
+        #end if
+        check(_ft_outline_done(lib.lib, self._ftobj))
         self._ftobj = result
+        self._finalize = weakref.finalize(self, _done_outline, result, self._lib)
     #end _append
 
     def append(self, other) :
@@ -3103,19 +3649,13 @@ def_extra_fields \
 class Glyph :
     "Pythonic representation of an FT.Glyph. Get one of these from GlyphSlot.get_glyph."
 
-    __slots__ = ("_ftobj",) # to forestall typos
+    __slots__ = ("__weakref__", "_ftobj", "_finalize") # to forestall typos
 
     def __init__(self, ftobj) :
         self._ftobj = ftobj
+        self._finalize = weakref.finalize(self, _done_glyph, ftobj)
     #end __init__
 
-    def __del__(self) :
-        if self._ftobj != None :
-            ft.FT_Done_Glyph(self._ftobj)
-            self._ftobj = None
-        #end if
-    #end __del__
-
     def copy(self) :
         "returns a copy of the Glyph."
         result = FT.Glyph()
@@ -3135,15 +3675,19 @@ class Glyph :
     def to_bitmap(self, render_mode, origin, replace) :
         "converts the Glyph to a BitmapGlyph, offset by the specified Vector origin." \
         " If replace, then the contents of the current Glyph is replaced; otherwise" \
-        " a new Glyph object is returned. FIXME: FreeType bug? replace arg makes no" \
-        " difference; the Glyph object is always replaced."
-        result = ct.pointer(self._ftobj)
-        check(ft.FT_Glyph_To_Bitmap(result, render_mode, ct.byref(origin.to_ft_f26_6()), int(replace)))
+        " a new Glyph object is returned."
         if replace :
-            self._ftobj = result.contents
+            check(ft.FT_Glyph_To_Bitmap(ct.byref(self._ftobj), render_mode, ct.byref(origin.to_ft_f26_6()), 1))
+              # the old handle is consumed by FreeType and the new one written
+              # into the same storage, so the existing finalizer stays valid
             result = None
         else :
-            result = Glyph(result.contents)
+            # take an independent copy of the handle: pointing FreeType at my
+            # own handle storage would overwrite it with the new glyph (which
+            # made the replace arg appear to make no difference)
+            temp = ct.cast(self._ftobj, FT.Glyph)
+            check(ft.FT_Glyph_To_Bitmap(ct.byref(temp), render_mode, ct.byref(origin.to_ft_f26_6()), 0))
+            result = Glyph(temp)
         #end if
         return \
             result
@@ -3196,13 +3740,131 @@ def_extra_fields \
     struct_fields = ()
   )
 
+_buffer_pool = {}
+  # per-size free lists of pixel interchange buffers. Glyph-rendering loops
+  # allocate the same few sizes over and over, so recycling them avoids the
+  # per-glyph allocator and GC traffic. Buffers only come back here from the
+  # finalizers of Bitmap wrappers that own their storage.
+
+def _buffer_address(buffer) :
+    # returns the address of the storage of a bytearray. The transient
+    # ctypes view only pins the bytearray against resizing while it
+    # exists, but nothing here ever resizes a pixel buffer. The array
+    # form, unlike ct.c_ubyte.from_buffer, accepts zero-length buffers
+    # (empty bitmaps, e.g. a rendered space).
+    return \
+        ct.addressof((len(buffer) * ct.c_ubyte).from_buffer(buffer))
+#end _buffer_address
+
+def _acquire_buffer(size, fill) :
+    # returns a bytearray of exactly size bytes filled with the given
+    # byte value, recycling a pooled buffer if one fits. fill = None means
+    # the caller will overwrite every byte, so a recycled buffer need not
+    # be cleared first.
+    free = _buffer_pool.get(size)
+    if free :
+        buffer = free.pop()
+        if fill != None :
+            ct.memset(_buffer_address(buffer), fill, size)
+        #end if
+    elif fill != None and fill != 0 :
+        buffer = bytearray((fill,)) * size
+          # repeating a one-element bytearray allocates and fills the final
+          # buffer directly, without an intermediate full-size temporary
+    else :
+        buffer = bytearray(size)
+          # calloc-backed: no per-byte fill at all
+    #end if
+    return \
+        buffer
+#end _acquire_buffer
+
+def _release_buffer(buffer) :
+    if sys.getrefcount(buffer) == _release_refcount :
+        # nobody else kept hold of the storage, so it is safe to hand out again
+        _buffer_pool.setdefault(len(buffer), []).append(buffer)
+    #end if
+#end _release_buffer
+
+def _measure_release_refcount() :
+    # learns the refcount an otherwise-unreferenced buffer shows from inside
+    # a firing finalizer callback, by replicating the plumbing with a probe:
+    # a dying wrapper whose buffer slot is still populated while its weakref
+    # callbacks run, plus the finalizer’s own argument references. Measured
+    # rather than hard-coded, since it is an implementation detail of
+    # weakref.finalize and object teardown.
+
+    class anchor_type :
+        __slots__ = ("buffer", "__weakref__")
+    #end anchor_type
+
+#begin _measure_release_refcount
+    result = []
+    probe = bytearray(1)
+    anchor = anchor_type()
+    anchor.buffer = probe
+    weakref.finalize(anchor, lambda b : result.append(sys.getrefcount(b)), probe)
+    del probe, anchor # fires the finalizer
+    return \
+        result[0]
+#end _measure_release_refcount
+
+_release_refcount = _measure_release_refcount()
+
+def drain_buffer_pool() :
+    "discards all pooled pixel buffers, returning their storage to the allocator."
+    _buffer_pool.clear()
+#end drain_buffer_pool
+
+_stride_cache = {}
+
+def _cairo_stride(format, width) :
+    # memoized cairo.ImageSurface.format_stride_for_width. Rendering loops
+    # at a fixed point size see only a handful of widths, so after warm-up
+    # this saves a cairo FFI call per surface. Callers check for cairo first.
+    result = _stride_cache.get((format, width))
+    if result == None :
+        result = cairo.ImageSurface.format_stride_for_width(format, width)
+        _stride_cache[(format, width)] = result
+    #end if
+    return \
+        result
+#end _cairo_stride
+
+_mono_to_gray_lut = tuple \
+  (
+    bytes((0, 255)[b >> 7 - i & 1] for i in range(8)) for b in range(256)
+  ) # maps each byte of a PIXEL_MODE_MONO row to its eight PIXEL_MODE_GRAY pixels
+
+class _SurfaceGuard :
+    # context manager returned by Bitmap.as_cairo_surface: yields the
+    # surface and finishes it on exit, so cairo releases its reference
+    # to the underlying storage deterministically.
+
+    __slots__ = ("_surface",) # to forestall typos
+
+    def __init__(self, surface) :
+        self._surface = surface
+    #end __init__
+
+    def __enter__(self) :
+        return \
+            self._surface
+    #end __enter__
+
+    def __exit__(self, exception_type, exception_value, traceback) :
+        self._surface.finish()
+    #end __exit__
+
+#end _SurfaceGuard
+
 class Bitmap :
     "Pythonic representation of an FT.Bitmap. Get one of these from GlyphSlot.bitmap," \
     " Glyph.bitmap, Outline.get_bitmap() or Bitmap.new_with_array()."
     # Seems there are no public APIs for explicitly allocating storage for one of these;
     # all the publicly-accessible Bitmap objects are owned by their containing structures.
 
-    __slots__ = ("_ftobj", "_lib", "owner", "buffer") # to forestall typos
+    __slots__ = ("__weakref__", "_ftobj", "_lib", "owner", "buffer", "_finalize") # to forestall typos
 
     def __init__(self, ftobj, owner, lib) :
         # lib is not None if I am to manage my own storage under control of FreeType;
@@ -3211,106 +3873,224 @@ class Bitmap :
         self.buffer = None
         self.owner = None
         self._lib = None
+        self._finalize = None
         assert owner == None or lib == None
         if owner != None :
             self.owner = owner # keep a strong ref to ensure it doesn’t disappear unexpectedly
         elif lib != None :
             self._lib = weakref.ref(lib)
+            self._finalize = weakref.finalize(self, _done_bitmap, ftobj, self._lib)
         #end if
     #end __init__
 
-    def __del__(self) :
-        if self.buffer == None and self._lib != None and self._lib() != None :
-            if self._ftobj != None :
-                check(ft.FT_Bitmap_Done(self._lib().lib, self._ftobj))
-                self._ftobj = None
-            #end if
-        #end if
-    #end __del__
-
     @staticmethod
     def new_with_array(width, rows, pitch = None, bg = 0.0) :
-        "constructs a Bitmap with storage residing in a Python array. The pixel" \
+        "constructs a Bitmap with storage residing in a Python bytearray. The pixel" \
         " format is always PIXEL_MODE_GRAY."
         if pitch == None :
             if cairo == None :
                 raise NotImplementedError("Pycairo not installed, cannot calculate default pitch")
             #end if
-            pitch = cairo.ImageSurface.format_stride_for_width(cairo.FORMAT_A8, width)
+            pitch = _cairo_stride(cairo.FORMAT_A8, width)
               # simplify conversion to cairo.ImageSurface
         else :
             assert pitch >= width, "bitmap cannot fit specified width"
         #end if
-        buffer = array.array("B", bytes((round(bg * 255),)) * rows * pitch)
+        buffer = _acquire_buffer(rows * pitch, round(bg * 255))
         result = FT.Bitmap()
-        ft.FT_Bitmap_New(ct.byref(result))
+          # ctypes zero-initializes the struct, which is all FT_Bitmap_New did
         result.rows = rows
         result.width = width
         result.pitch = pitch
         result.pixel_mode = FT.PIXEL_MODE_GRAY
-        result.buffer = ct.cast(buffer.buffer_info()[0], ct.c_void_p)
+        result.buffer = ct.cast(_buffer_address(buffer), ct.c_void_p)
         result.num_grays = 256
         result = Bitmap(ct.pointer(result), None, None)
         result.buffer = buffer
+        result._finalize = weakref.finalize(result, _release_buffer, buffer)
         return \
             result
     #end new_with_array
 
     def copy_with_array(self, pitch = None) :
         "returns a new Bitmap which is a copy of this one, with storage residing in" \
-        " a Python array."
+        " a Python bytearray."
         src = self._ftobj.contents
         dst = FT.Bitmap()
-        ft.FT_Bitmap_New(ct.byref(dst))
-        for \
-            attr \
-        in \
-            (
-                "rows",
-                "width",
-                "pitch",
-                "num_grays",
-                "pixel_mode",
-            ) \
-        :
-            setattr(dst, attr, getattr(src, attr))
-        #end for
+          # ctypes zero-initializes the struct, which is all FT_Bitmap_New did
+        ct.memmove(ct.addressof(dst), ct.addressof(src), ct.sizeof(FT.Bitmap))
+          # one native copy of the whole struct instead of five attribute
+          # get/set pairs; buffer (and pitch, if overridden) fixed up below
         buffer = self.to_array(pitch)
-        dst.buffer = ct.cast(buffer.buffer_info()[0], ct.c_void_p)
+        if pitch != None :
+            dst.pitch = pitch
+        elif dst.pitch < 0 :
+            dst.pitch = - dst.pitch
+              # to_array returns top-down storage
+        #end if
+        dst.buffer = ct.cast(_buffer_address(buffer), ct.c_void_p)
         result = Bitmap(ct.pointer(dst), None, None)
         result.buffer = buffer
+        result._finalize = weakref.finalize(result, _release_buffer, buffer)
         return \
             result
     #end copy_with_array
 
+    @property
+    def pixels(self) :
+        "a memoryview over the Bitmap’s pixel storage, without copying. The view" \
+        " is only valid while the Bitmap (or the structure that owns its storage)" \
+        " remains alive, and writing to it writes directly to the Bitmap."
+        bm = self._ftobj.contents
+        if bm.pitch < 0 :
+            raise NotImplementedError("can’t cope with negative bitmap pitch")
+        #end if
+        if bm.rows * bm.pitch == 0 :
+            # empty bitmap (e.g. a rendered space): the buffer pointer is
+            # null, so don’t try to dereference it
+            return \
+                memoryview(bytearray(0))
+        #end if
+        return \
+            memoryview((bm.rows * bm.pitch * ct.c_ubyte).from_address(bm.buffer)).cast("B")
+              # the cast normalizes ctypes’ “<B” format, which CPython
+              # refuses to index or assign through
+    #end pixels
+
+    def as_memoryview(self) :
+        "returns a two-dimensional memoryview of shape (rows, pitch) over the" \
+        " Bitmap’s pixel storage, without copying. The same lifetime and aliasing" \
+        " rules as for pixels apply. NumPy users can pass this to numpy.asarray" \
+        " to get a zero-copy uint8 ndarray of the same shape. For an empty Bitmap" \
+        " (no rows or zero pitch) the result is a flat zero-length view instead," \
+        " since CPython cannot represent zero-sized dimensions in a cast view."
+        bm = self._ftobj.contents
+        pitch = bm.pitch
+        if pitch < 0 :
+            raise NotImplementedError("can’t cope with negative bitmap pitch")
+        #end if
+        if bm.rows * pitch == 0 :
+            # empty bitmap: the buffer pointer is null, and CPython cannot
+            # represent zero-sized dimensions in a cast view anyway, so
+            # settle for a flat empty view
+            return \
+                memoryview(bytearray(0))
+        #end if
+        return \
+            memoryview((bm.rows * pitch * ct.c_ubyte).from_address(bm.buffer)) \
+                .cast("B").cast("B", (bm.rows, pitch))
+                  # first cast normalizes the ctypes “<B” format so the
+                  # shaped cast is accepted
+    #end as_memoryview
+
     def to_array(self, pitch = None) :
-        "returns a Python array object containing a copy of the Bitmap pixels."
+        "returns a Python bytearray containing a copy of the Bitmap pixels," \
+        " stored top-down regardless of the sign of my pitch."
+        src_pitch = self.pitch
+        rows = self.rows
         if pitch == None :
-            pitch = self.pitch
+            pitch = abs(src_pitch)
         #end if
-        buffer_size = self.rows * pitch
-        buffer = array.array("B", b"0" * buffer_size)
-        dstaddr = buffer.buffer_info()[0]
+        buffer_size = rows * pitch
         srcaddr = ct.cast(self._ftobj.contents.buffer, ct.c_void_p).value
-        src_pitch = self.pitch
-        if pitch == src_pitch :
-            ct.memmove(dstaddr, srcaddr, buffer_size)
+        if src_pitch < 0 :
+            # bottom-up storage: successive rows sit at descending addresses,
+            # so copy them a row at a time into top-down order
+            src_pitch = - src_pitch
+            assert pitch >= src_pitch, "bitmap cannot fit specified pitch"
+            buffer = _acquire_buffer(buffer_size, (0, None)[pitch == src_pitch])
+            base = srcaddr - (rows - 1) * src_pitch
+              # lowest-addressed (bottommost) row
+            src = memoryview((rows * src_pitch * ct.c_ubyte).from_address(base)).cast("B")
+            dst = memoryview(buffer)
+            for dst_pos, src_pos in \
+                zip(range(0, buffer_size, pitch), range((rows - 1) * src_pitch, -1, - src_pitch)) \
+            :
+                dst[dst_pos : dst_pos + src_pitch] = src[src_pos : src_pos + src_pitch]
+            #end for
+        elif pitch == src_pitch :
+            buffer = _acquire_buffer(buffer_size, None)
+              # the copy overwrites every byte, so skip the clearing pass
+            ct.memmove(_buffer_address(buffer), srcaddr, buffer_size)
+              # a single native memmove: libc already moves word-at-a-time
+              # where alignment allows, so no Python-level word view would
+              # make this any faster
         else :
-            # have to copy a row at a time
-            if src_pitch < 0 or pitch < 0 :
-                raise NotImplementedError("can’t cope with negative bitmap pitch")
-            #end if
+            # widened pitch: copy a row at a time; memoryview slice assignment
+            # keeps each row copy a plain C memcpy without a ctypes foreign
+            # call (and its argument marshalling) per row
             assert pitch > src_pitch
-            for i in range(self.rows) :
-                ct.memmove(dstaddr, srcaddr, src_pitch)
-                dstaddr += pitch
-                srcaddr += src_pitch
+            buffer = _acquire_buffer(buffer_size, 0)
+              # padding between rows needs to be zeroed
+            src = memoryview((rows * src_pitch * ct.c_ubyte).from_address(srcaddr)).cast("B")
+              # the cast reconciles the ctypes buffer format with plain bytes
+            dst = memoryview(buffer)
+            for dst_pos, src_pos in \
+                zip(range(0, buffer_size, pitch), range(0, rows * src_pitch, src_pitch)) \
+            :
+                dst[dst_pos : dst_pos + src_pitch] = src[src_pos : src_pos + src_pitch]
             #end for
         #end if
         return \
             buffer
     #end to_array
 
+    def _expand_mono_rows(self, pitch) :
+        # returns a Python array of PIXEL_MODE_GRAY pixels expanded from my
+        # PIXEL_MODE_MONO contents, padded to the given pitch. Each source
+        # byte is looked up in a 256-entry table of 8-pixel strings, so the
+        # expansion runs bytewise rather than bitwise.
+        src = self._ftobj.contents
+        src_pitch = src.pitch
+        if src_pitch < 0 :
+            raise NotImplementedError("can’t cope with negative bitmap pitch")
+        #end if
+        width = src.width
+        rows = src.rows
+        lut = _mono_to_gray_lut
+        buffer = _acquire_buffer(rows * pitch, (0, None)[pitch == width])
+        raw = ct.string_at(ct.cast(src.buffer, ct.c_void_p).value, rows * src_pitch)
+        dst = memoryview(buffer)
+        for dst_pos, src_pos in \
+            zip(range(0, rows * pitch, pitch), range(0, rows * src_pitch, src_pitch)) \
+        :
+            row = b"".join(map(lut.__getitem__, raw[src_pos : src_pos + src_pitch]))
+            dst[dst_pos : dst_pos + width] = row[:width]
+        #end for
+        return \
+            buffer
+    #end _expand_mono_rows
+
+    def expand_mono_to_gray(self, pitch = None) :
+        "returns a new Bitmap which is a copy of this PIXEL_MODE_MONO one," \
+        " expanded to PIXEL_MODE_GRAY with storage residing in a Python bytearray." \
+        " Unlike convert(), this does not need a Library and runs entirely in" \
+        " Python."
+        src = self._ftobj.contents
+        if src.pixel_mode != FT.PIXEL_MODE_MONO :
+            raise TypeError("bitmap is not PIXEL_MODE_MONO")
+        #end if
+        if pitch == None :
+            pitch = src.width
+        else :
+            assert pitch >= src.width, "bitmap cannot fit specified width"
+        #end if
+        buffer = self._expand_mono_rows(pitch)
+        dst = FT.Bitmap()
+          # zero-initialized by ctypes; no need for FT_Bitmap_New
+        dst.rows = src.rows
+        dst.width = src.width
+        dst.pitch = pitch
+        dst.pixel_mode = FT.PIXEL_MODE_GRAY
+        dst.num_grays = 256
+        dst.buffer = ct.cast(_buffer_address(buffer), ct.c_void_p)
+        result = Bitmap(ct.pointer(dst), None, None)
+        result.buffer = buffer
+        result._finalize = weakref.finalize(result, _release_buffer, buffer)
+        return \
+            result
+    #end expand_mono_to_gray
+
     # wrappers for FT.Bitmap functions
     # <http://www.freetype.org/freetype2/docs/reference/ft2-bitmap_handling.html>
 
@@ -3327,7 +4107,7 @@ class Bitmap :
         ft.FT_Bitmap_New(result)
         check(ft.FT_Bitmap_Copy(lib.lib, self._ftobj, result))
         return \
-            Bitmap(result, None, lib.lib)
+            Bitmap(result, None, lib)
     #end copy
 
     def embolden(self, lib, x_strength, y_strength) :
@@ -3350,41 +4130,66 @@ class Bitmap :
         ft.FT_Bitmap_New(result)
         check(ft.FT_Bitmap_Convert(lib.lib, self._ftobj, result, alignment))
         return \
-            Bitmap(result, None, lib.lib)
+            Bitmap(result, None, lib)
     #end convert
 
     # end wrappers for FT.Bitmap functions
 
     def make_image_surface(self, copy = True) :
-        "creates a Cairo ImageSurface containing (a copy of) the Bitmap pixels."
+        "creates a Cairo ImageSurface containing (a copy of) the Bitmap pixels." \
+        " If copy is False and the pitch already suits Cairo, the surface is a" \
+        " zero-copy view over the Bitmap’s storage, and remains valid only as" \
+        " long as that storage does."
         if cairo == None :
             raise NotImplementedError("Pycairo not installed")
         #end if
-        if self.pixel_mode == FT.PIXEL_MODE_MONO :
-            cairo_format = cairo.FORMAT_A1
-        elif self.pixel_mode == FT.PIXEL_MODE_GRAY :
+        bm = self._ftobj.contents
+          # read the struct once, bypassing the generated per-field properties
+        pixel_mode = bm.pixel_mode
+        if pixel_mode == FT.PIXEL_MODE_GRAY :
+            # the common case in practice: grayscale, copied, pitches matching
             cairo_format = cairo.FORMAT_A8
+            dst_pitch = _cairo_stride(cairo_format, bm.width)
+            if copy or dst_pitch != bm.pitch or bm.pitch < 0 :
+                pixels = self.to_array(dst_pitch)
+            else :
+                pixels = self.buffer
+                if pixels == None :
+                    # FreeType-owned storage: hand Cairo a writable view over it
+                    # rather than copying the image into a fresh array
+                    pixels = self.pixels
+                #end if
+            #end if
+        elif pixel_mode == FT.PIXEL_MODE_MONO :
+            # cairo’s A1 bit order is platform-dependent and disagrees with
+            # FreeType’s mono format on little-endian machines, so expand to
+            # a byte per pixel and hand cairo an A8 surface instead
+            cairo_format = cairo.FORMAT_A8
+            dst_pitch = _cairo_stride(cairo_format, bm.width)
+            pixels = self._expand_mono_rows(dst_pitch)
         else :
-            raise NotImplementedError("unsupported bitmap format %d" % self.pixel_mode)
-        #end if
-        src_pitch = self.pitch
-        dst_pitch = cairo.ImageSurface.format_stride_for_width(cairo_format, self.width)
-        if not copy and dst_pitch == src_pitch and self.buffer != None :
-            pixels = self.buffer
-        else :
-            pixels = self.to_array(dst_pitch)
+            raise NotImplementedError("unsupported bitmap format %d" % pixel_mode)
         #end if
         return \
             cairo.ImageSurface.create_for_data \
               (
                 pixels,
                 cairo_format,
-                self.width,
-                self.rows,
+                bm.width,
+                bm.rows,
                 dst_pitch
               )
     #end make_image_surface
 
+    def as_cairo_surface(self, copy = False) :
+        "returns a context manager yielding a cairo ImageSurface over the Bitmap" \
+        " pixels — by default a zero-copy view where the pitch allows. On exit the" \
+        " surface is finished, so cairo drops its reference to the storage" \
+        " deterministically instead of waiting for garbage collection."
+        return \
+            _SurfaceGuard(self.make_image_surface(copy))
+    #end as_cairo_surface
+
 #end Bitmap
 def_extra_fields \
   (
@@ -3402,9 +4207,17 @@ def_extra_fields \
   )
 
 class Stroker :
-    "representation of a FreeType Stroker. Instantiate this with a Library instance."
+    "representation of a FreeType Stroker. Instantiate this with a Library instance." \
+    " Keeps its Library alive; call close, or use as a context manager, to dispose" \
+    " of the stroker (and release the Library reference) without waiting for" \
+    " garbage collection."
 
-    __slots__ = ("_ftobj", "_lib") # to forestall typos
+    __slots__ = \
+        (
+            "__weakref__", "_ftobj", "_lib", "_lib_handle", "_finalize",
+            "_scratch_outline", "_scratch_outline_ref", "_scratch_cap",
+            "_num_points", "_num_points_ref", "_num_contours", "_num_contours_ref",
+        ) # to forestall typos
 
     def __init__(self, lib = None) :
         if lib == None :
@@ -3412,53 +4225,126 @@ class Stroker :
         elif not isinstance(lib, Library) :
             raise TypeError("expecting a Library")
         #end if
-        self._lib = weakref.ref(lib)
-        result = ct.pointer(ct.c_void_p())
-        check(ft.FT_Stroker_New(lib.lib, result))
-        self._ftobj = result.contents
+        self._lib = lib
+          # strong reference: holding the Library ensures it outlives the
+          # stroker, so the export paths can use the raw handle without
+          # re-dereferencing and re-checking a weak ref every call
+        self._lib_handle = lib.lib
+        ftobj = ct.c_void_p()
+        check(ft.FT_Stroker_New(lib.lib, ct.byref(ftobj)))
+        self._ftobj = ftobj
+        self._scratch_outline = FT.Outline()
+        self._scratch_outline_ref = ct.pointer(self._scratch_outline)
+        self._scratch_cap = (0, 0)
+          # reused by export/export_border: the scratch arrays grow to the
+          # high-water mark of exported (points, contours) and are only
+          # reallocated when an export outgrows them
+        self._finalize = \
+            weakref.finalize(self, _done_stroker, ftobj, lib.lib, self._scratch_outline_ref)
+        self._num_points = ct.c_int()
+        self._num_points_ref = ct.byref(self._num_points)
+        self._num_contours = ct.c_int()
+        self._num_contours_ref = ct.byref(self._num_contours)
     #end __init__
 
-    def __del__(self) :
-        if self._ftobj != None and self._lib != None and self._lib() != None :
-            ft.FT_Stroker_Done(self._ftobj)
+    def close(self) :
+        "disposes of the stroker now, rather than when garbage collection" \
+        " gets around to it. The Stroker object may not be used after this."
+        if self._ftobj != None :
+            self._finalize()
             self._ftobj = None
+            self._lib_handle = None
+            self._lib = None
         #end if
-    #end __del__
+    #end close
+
+    def __enter__(self) :
+        return \
+            self
+    #end __enter__
+
+    def __exit__(self, exception_type, exception_value, traceback) :
+        self.close()
+    #end __exit__
 
     def stroke(self, glyph, replace) :
         if not isinstance(glyph, Glyph) :
             raise TypeError("expecting a Glyph")
         #end if
-        result = ct.pointer(glyph._ftobj)
-        check(ft.FT_Glyph_Stroke(result, self._ftobj, int(replace)))
         if replace :
-            glyph._ftobj = result.contents
+            check(_ft_glyph_stroke(ct.byref(glyph._ftobj), self._ftobj, 1))
+              # FreeType frees the old glyph and writes the new handle into
+              # the same storage, so the existing finalizer stays valid
             result = None
         else :
-            result = Glyph(result.contents)
+            # take an independent copy of the handle: pointing FreeType at
+            # the caller’s own handle storage would overwrite it with the
+            # new glyph, leaving the source wrapper’s finalizer to free
+            # the wrong one
+            temp = ct.cast(glyph._ftobj, FT.Glyph)
+            check(_ft_glyph_stroke(ct.byref(temp), self._ftobj, 0))
+            result = Glyph(temp)
         #end if
         return \
             result
     #end stroke
 
+    def stroke_many(self, glyphs, replace) :
+        "strokes each Glyph in the sequence with my current settings, in a single" \
+        " Python frame. If replace, the Glyphs are updated in place and None is" \
+        " returned; otherwise a list of new stroked Glyphs is returned. Error" \
+        " semantics match stroke: the first failing glyph raises, leaving earlier" \
+        " ones already stroked."
+        glyphs = list(glyphs)
+        if not all(isinstance(glyph, Glyph) for glyph in glyphs) :
+            raise TypeError("expecting a sequence of Glyphs")
+        #end if
+        ftobj = self._ftobj
+        assert ftobj != None, "stroker has been closed"
+        do_stroke = _ft_glyph_stroke
+        byref = ct.byref
+        if replace :
+            result = None
+            for glyph in glyphs :
+                check(do_stroke(byref(glyph._ftobj), ftobj, 1))
+                  # in-place handle update; see stroke
+            #end for
+        else :
+            result = []
+            append = result.append
+            cast = ct.cast
+            glyph_type = FT.Glyph
+            for glyph in glyphs :
+                # handle copied first; see stroke
+                temp = cast(glyph._ftobj, glyph_type)
+                check(do_stroke(byref(temp), ftobj, 0))
+                append(Glyph(temp))
+            #end for
+        #end if
+        return \
+            result
+    #end stroke_many
+
     def stroke_border(self, glyph, inside, replace) :
         if not isinstance(glyph, Glyph) :
             raise TypeError("expecting a Glyph")
         #end if
-        result = ct.pointer(glyph._ftobj)
-        check(ft.FT_Glyph_StrokeBorder(result, self._ftobj, int(inside), int(replace)))
         if replace :
-            glyph._ftobj = result.contents
+            check(ft.FT_Glyph_StrokeBorder(ct.byref(glyph._ftobj), self._ftobj, int(inside), 1))
+              # in-place handle update; see stroke
             result = None
         else :
-            result = Glyph(result.contents)
+            # see stroke for why the handle must be copied first
+            temp = ct.cast(glyph._ftobj, FT.Glyph)
+            check(ft.FT_Glyph_StrokeBorder(ct.byref(temp), self._ftobj, int(inside), 0))
+            result = Glyph(temp)
         #end if
         return \
             result
     #end stroke_border
 
     def set(self, radius, line_cap, line_join, miter_limit) :
-        ft.FT_Stroker_Set(self._ftobj, to_f16_16(radius), line_cap, line_join, to_f16_16(miter_limit))
+        _ft_stroker_set(self._ftobj, to_f16_16(radius), line_cap, line_join, to_f16_16(miter_limit))
     #end set
 
     def rewind(self) :
@@ -3469,73 +4355,112 @@ class Stroker :
         if not isinstance(outline, Outline) :
             raise TypeError("expecting an Outline")
         #end if
-        check(ft.FT_Stroker_ParseOutline(self._ftobj, outline._ftobj, int(opened)))
+        check(_ft_stroker_parse_outline(self._ftobj, outline._ftobj, int(opened)))
     #end parse_outline
 
     # TODO: FT_Stroker_BeginSubPath, FT_Stroker_EndSubPath,
     # FT_Stroker_LineTo, FT_Stroker_ConicTo, FT_Stroker_CubicTo
 
+    def _get_scratch(self, nr_points, nr_contours) :
+        # returns my scratch outline pointer with array capacity for at
+        # least the given counts, reallocating only when they are exceeded.
+        # FT_Outline_Done on the old arrays plus FT_Outline_New only happen
+        # on growth, so steady-state exports do no FreeType allocation.
+        cap_points, cap_contours = self._scratch_cap
+        temp = self._scratch_outline_ref
+        if nr_points > cap_points or nr_contours > cap_contours :
+            if cap_points or cap_contours :
+                check(_ft_outline_done(self._lib_handle, temp))
+            #end if
+            nr_points = max(nr_points, cap_points * 3 // 2)
+            nr_contours = max(nr_contours, cap_contours * 3 // 2)
+            check(_ft_outline_new(self._lib_handle, nr_points, nr_contours, temp))
+            self._scratch_cap = (nr_points, nr_contours)
+        #end if
+        temp.contents.n_points = 0
+        temp.contents.n_contours = 0
+        return \
+            temp
+    #end _get_scratch
+
     def get_border_counts(self, border) :
         "returns a pair of integers (anum_points, anum_contours)."
-        anum_points = ct.c_int()
-        anum_contours = ct.c_int()
-        check(ft.FT_Stroker_GetBorderCounts
+        check(_ft_stroker_get_border_counts
           (
             self._ftobj,
             border,
-            ct.byref(anum_points),
-            ct.byref(anum_contours)
+            self._num_points_ref,
+            self._num_contours_ref
           ))
         return \
-            (anum_points.value, anum_contours.value)
+            (self._num_points.value, self._num_contours.value)
     #end get_border_counts
 
     def export_border(self, border, outline) :
         "appends the border contours onto the Outline object, extending its storage as necessary."
-        assert self._lib() != None, "parent Library has gone"
+        assert self._ftobj != None, "stroker has been closed"
         if not isinstance(outline, Outline) :
             raise TypeError("expecting an Outline")
         #end if
-        nr_points, nr_contours = self.get_border_counts(border)
-        temp = ct.pointer(FT.Outline())
-        check(ft.FT_Outline_New(self._lib().lib, nr_points, nr_contours, temp))
-        temp.contents.n_points = 0
-        temp.contents.n_contours = 0
-        ft.FT_Stroker_ExportBorder(self._ftobj, border, temp)
+        check(_ft_stroker_get_border_counts
+            (self._ftobj, border, self._num_points_ref, self._num_contours_ref))
+        temp = self._get_scratch(self._num_points.value, self._num_contours.value)
+        _ft_stroker_export_border(self._ftobj, border, temp)
         outline._append(temp)
-        check(ft.FT_Outline_Done(self._lib().lib, temp))
     #end export_border
 
     def get_counts(self) :
         "returns a pair of integers (anum_points, anum_contours)."
-        anum_points = ct.c_int()
-        anum_contours = ct.c_int()
-        check(ft.FT_Stroker_GetCounts
+        check(_ft_stroker_get_counts
           (
             self._ftobj,
-            ct.byref(anum_points),
-            ct.byref(anum_contours)
+            self._num_points_ref,
+            self._num_contours_ref
           ))
         return \
-            (anum_points.value, anum_contours.value)
+            (self._num_points.value, self._num_contours.value)
     #end get_counts
 
     def export(self, outline) :
         "appends the contours onto the Outline object, extending its storage as necessary."
-        assert self._lib() != None, "parent Library has gone"
+        assert self._ftobj != None, "stroker has been closed"
         if not isinstance(outline, Outline) :
             raise TypeError("expecting an Outline")
         #end if
-        nr_points, nr_contours = self.get_counts()
-        temp = ct.pointer(FT.Outline())
-        check(ft.FT_Outline_New(self._lib().lib, nr_points, nr_contours, temp))
-        temp.contents.n_points = 0
-        temp.contents.n_contours = 0
-        ft.FT_Stroker_Export(self._ftobj, temp)
+        check(_ft_stroker_get_counts
+            (self._ftobj, self._num_points_ref, self._num_contours_ref))
+        temp = self._get_scratch(self._num_points.value, self._num_contours.value)
+        _ft_stroker_export(self._ftobj, temp)
         outline._append(temp)
-        check(ft.FT_Outline_Done(self._lib().lib, temp))
     #end export
 
+    def apply(self, outline, radius, line_cap, line_join, miter_limit, opened = False, dest = None) :
+        "strokes the given Outline in one go, fusing set, parse_outline and" \
+        " export into a single call, and returns the Outline holding the result" \
+        " (a new one if dest is None). This is the fast path for bulk outlining;" \
+        " the stepwise methods remain for workflows that need them."
+        ftobj = self._ftobj
+        assert ftobj != None, "stroker has been closed"
+        if not isinstance(outline, Outline) :
+            raise TypeError("expecting an Outline")
+        #end if
+        if dest == None :
+            dest = Outline.new(self._lib)
+        elif not isinstance(dest, Outline) :
+            raise TypeError("expecting dest to be an Outline")
+        #end if
+        _ft_stroker_set(ftobj, to_f16_16(radius), line_cap, line_join, to_f16_16(miter_limit))
+        check(_ft_stroker_parse_outline(ftobj, outline._ftobj, int(opened)))
+          # FT_Stroker_ParseOutline rewinds the stroker itself, so no
+          # separate rewind call is needed
+        check(_ft_stroker_get_counts(ftobj, self._num_points_ref, self._num_contours_ref))
+        temp = self._get_scratch(self._num_points.value, self._num_contours.value)
+        _ft_stroker_export(ftobj, temp)
+        dest._append(temp)
+        return \
+            dest
+    #end apply
+
 #end Stroker
 
 del def_extra_fields # my job is done